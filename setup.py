@@ -0,0 +1,24 @@
+"""
+Build script for the assistant bot.
+
+When mypyc is installed (``pip install mypy``), src/main.py is compiled to
+a C extension; otherwise the module is installed as plain Python.
+
+    python setup.py build_ext --inplace
+"""
+from setuptools import setup
+
+try:
+    from mypyc.build import mypycify
+except ImportError:
+    ext_modules = []
+else:
+    ext_modules = mypycify(["src/main.py"])
+
+setup(
+    name="assistant-bot",
+    version="0.1.0",
+    package_dir={"": "src"},
+    py_modules=["main"],
+    ext_modules=ext_modules,
+)
@@ -1,40 +1,282 @@
 #!/usr/bin/env python3
-import pickle
-from collections import UserDict
-from datetime import datetime, date, timedelta
-from typing import List
+from __future__ import annotations
+
+import io
+import os
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, Type, Union
+
+# pickle, gzip and datetime are imported where they are used to keep
+# start-up fast when they are not needed.
+if TYPE_CHECKING:
+    from datetime import date
+
+# datetime.date, cached by _load_date() on first use so per-record code
+# does not run an import statement on every call.
+_date: Optional[Type[date]] = None
+
+
+def _load_date() -> Type[date]:
+    """
+    Import datetime.date and cache it in _date.
+
+    :return: The date class.
+    """
+    global _date
+    from datetime import date
+
+    _date = date
+    return date
 
 
 # --- Persistence Functions ---
 
 def save_data(book, filename: str = "addressbook.pkl") -> None:
     """
-    Save the AddressBook to a file using pickle.
+    Save the AddressBook to a gzip-compressed pickle file, or to a JSON
+    file if the file name ends with ".json".
+
+    The data is written to a temporary file which then replaces the
+    target, so a crash mid-write leaves the previous snapshot intact. If
+    writing fails, the temporary file is removed.
 
     :param book: The AddressBook instance to save.
     :param filename: The file name to use for saving.
     """
-    with open(filename, "wb") as f:
-        pickle.dump(book, f)
+    tmp_filename = filename + ".tmp"
+    raw = open(tmp_filename, "wb", buffering=0)
+    try:
+        with raw, io.BufferedWriter(raw, buffer_size=128 * 1024) as f:
+            if filename.endswith(".json"):
+                f.write(_book_to_json(book))
+            else:
+                import gzip
+                import pickle
+
+                # Level 1 favours speed; the payload still shrinks several times.
+                with gzip.GzipFile(fileobj=f, mode="wb", compresslevel=1) as gz:
+                    pickle.Pickler(gz, protocol=pickle.HIGHEST_PROTOCOL).dump(book)
+            f.flush()
+            os.fsync(raw.fileno())
+        os.replace(tmp_filename, filename)
+    except BaseException:
+        os.unlink(tmp_filename)
+        raise
 
 
 def load_data(filename: str = "addressbook.pkl"):
     """
-    Load the AddressBook from a file using pickle.
+    Load the AddressBook from a gzip-compressed pickle file (or a JSON
+    file if the file name ends with ".json") and replay the journal.
+    Uncompressed pickle snapshots are still accepted.
+
+    The journal belonging to the snapshot is filename + ".log". If it
+    contained any records, they are compacted into a fresh snapshot and
+    the journal is truncated. A journal ending in a torn or unreadable
+    record is truncated too, so new records are never appended after it.
 
     :param filename: The file name to load from.
     :return: The loaded AddressBook or a new AddressBook if file not found.
     """
     try:
         with open(filename, "rb") as f:
-            return pickle.load(f)
+            data = f.read()
     except FileNotFoundError:
-        return AddressBook()
+        book = AddressBook()
+    else:
+        book = _book_from_json(data) if filename.endswith(".json") else _book_from_pickle(data)
+    journal_filename = filename + ".log"
+    count, torn = replay_journal(book, journal_filename)
+    if count:
+        # save_data replaces the snapshot atomically, so the journal is only
+        # dropped once its records are safely on disk.
+        save_data(book, filename)
+    if count or torn:
+        open(journal_filename, "wb").close()
+    return book
+
+
+def _book_from_pickle(data: bytes) -> AddressBook:
+    """
+    Unpickle an AddressBook, decompressing it first if it is gzipped.
+
+    :param data: The snapshot file contents.
+    :return: The loaded AddressBook.
+    """
+    import gzip
+    import pickle
+
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    try:
+        book = pickle.loads(data)
+    except (AttributeError, KeyError, TypeError) as e:
+        # Raised by the __setstate__ hooks on state they do not recognise.
+        raise ValueError("Unsupported address book file.") from e
+    # A bare AddressBook without state (no birthday index) is rejected too,
+    # so a mismatched file is never compacted over as an empty book.
+    if not isinstance(book, AddressBook) or not hasattr(book, "_bday_records"):
+        raise ValueError("Unsupported address book file.")
+    return book
+
+
+def _book_to_json(book: AddressBook) -> bytes:
+    """
+    Serialize an AddressBook as {name: {"phones": [...], "birthday": ordinal}}.
+
+    orjson is used when it is installed, the standard json module otherwise.
+
+    :param book: The AddressBook instance to serialize.
+    :return: UTF-8 encoded JSON.
+    """
+    payload = {}
+    for record in book.values():
+        name, phones, birthday = record.to_row()
+        payload[name] = {"phones": list(phones), "birthday": birthday}
+    try:
+        import orjson  # type: ignore[import-not-found]
+    except ImportError:
+        import json
+
+        return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    return orjson.dumps(payload)
+
+
+def _book_from_json(data: bytes) -> AddressBook:
+    """
+    Build an AddressBook from JSON produced by _book_to_json.
+
+    :param data: UTF-8 encoded JSON.
+    :return: The loaded AddressBook.
+    """
+    try:
+        import orjson  # type: ignore[import-not-found]
+    except ImportError:
+        import json
+
+        payload = json.loads(data)
+    else:
+        payload = orjson.loads(data)
+    if not isinstance(payload, dict):
+        raise ValueError("Invalid address book file.")
+    # The rows bypass validation in Record._rebuild, so check them here.
+    return AddressBook._rebuild(tuple(_json_row(name, fields) for name, fields in payload.items()))
+
+
+def _json_row(name: str, fields: Any) -> tuple:
+    """
+    Validate one JSON address book entry.
+
+    :param name: The contact's name.
+    :param fields: The entry, {"phones": [...], "birthday": ordinal or null}.
+    :return: A (name, phones, birthday_ordinal) tuple for Record._rebuild.
+    :raises ValueError: If the entry is malformed.
+    """
+    date_type = _date or _load_date()
+    phones = fields.get("phones") if isinstance(fields, dict) else None
+    birthday = fields.get("birthday") if isinstance(fields, dict) else None
+    if (not isinstance(phones, list) or not all(isinstance(phone, str) for phone in phones)
+            or not (birthday is None or (type(birthday) is int and 1 <= birthday <= date_type.max.toordinal()))):
+        raise ValueError(f"Invalid address book entry: {name!r}")
+    Name.validate(name)
+    for phone in phones:
+        Phone.validate(phone)
+    return name, tuple(phones), birthday
+
+
+# --- Journal Functions ---
+
+OP_ADD_CONTACT = 1
+OP_ADD_PHONE = 2
+OP_EDIT_PHONE = 3
+OP_ADD_BIRTHDAY = 4
+
+# Each journal record is an (op, payload length) header followed by the
+# payload: the operation's string arguments joined with NUL, UTF-8 encoded.
+_FRAME_HEADER = struct.Struct("<BI")
+
+
+def open_journal(filename: str = "addressbook.pkl") -> io.BufferedWriter:
+    """
+    Open the journal of a snapshot file for appending.
+
+    :param filename: The snapshot file name; the journal is filename + ".log".
+    :return: A buffered binary writer positioned at the end of the journal.
+    """
+    return io.BufferedWriter(open(filename + ".log", "ab", buffering=0), buffer_size=128 * 1024)
+
+
+def write_journal(journal: io.BufferedWriter, op: int, *fields: str) -> None:
+    """
+    Append a single mutation record to the journal and flush it.
+
+    :param journal: The writer returned by open_journal.
+    :param op: One of the OP_* constants.
+    :param fields: The string arguments of the operation.
+    """
+    payload = "\0".join(fields).encode("utf-8")
+    journal.write(_FRAME_HEADER.pack(op, len(payload)) + payload)
+    journal.flush()
+
+
+def replay_journal(book, filename: str = "addressbook.pkl.log") -> Tuple[int, bool]:
+    """
+    Apply the records stored in a journal file to the AddressBook.
+
+    Replay stops at the first record that is truncated (e.g. after a crash)
+    or cannot be decoded or applied; it and everything after it are ignored.
+
+    :param book: The AddressBook instance to update.
+    :param filename: The journal file name.
+    :return: The number of records applied, and whether replay stopped
+             before the end of the file.
+    """
+    try:
+        with open(filename, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return 0, False
+    offset = 0
+    count = 0
+    while offset < len(data):
+        if offset + _FRAME_HEADER.size > len(data):
+            return count, True
+        op, length = _FRAME_HEADER.unpack_from(data, offset)
+        offset += _FRAME_HEADER.size
+        if offset + length > len(data):
+            return count, True
+        payload = data[offset:offset + length]
+        offset += length
+        try:
+            fields = payload.decode("utf-8").split("\0")
+            name = fields[0]
+            record = book.find(name)
+            if op == OP_ADD_CONTACT:
+                if record is None:
+                    book.add_record(Record(name))
+            elif record is None:
+                continue
+            elif op == OP_ADD_PHONE:
+                record.add_phone(fields[1])
+            elif op == OP_EDIT_PHONE:
+                record.edit_phone(fields[1], fields[2])
+            elif op == OP_ADD_BIRTHDAY:
+                record.add_birthday(fields[1])
+        except (IndexError, ValueError):
+            # ValueError covers UnicodeDecodeError and failed validation.
+            return count, True
+        count += 1
+    return count, False
 
 
 # --- Utility Function ---
 
-def parse_input(user_input: str) -> (str, list):
+def parse_input(user_input: str) -> Tuple[str, List[str]]:
     """
     Parse user input into a command and its arguments.
 
@@ -42,11 +284,11 @@ def parse_input(user_input: str) -> (str, list):
     :return: A tuple where the first element is the command (in lowercase)
              and the second element is a list of arguments.
     """
-    parts = user_input.split()
+    parts = user_input.split(maxsplit=1)
     if not parts:
         return "", []
-    command = parts[0].strip().lower()
-    args = parts[1:]
+    command = parts[0].lower()
+    args = parts[1].split() if len(parts) > 1 else []
     return command, args
 
 
@@ -59,9 +301,15 @@ class Field:
     :param value: The field value.
     """
 
-    def __init__(self, value: str) -> None:
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
         self.value = value
 
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Only used for files written by the original object-graph format.
+        self.value = state["value"]
+
     def __str__(self) -> str:
         return str(self.value)
 
@@ -73,10 +321,26 @@ class Name(Field):
     :param value: The contact's name.
     """
 
+    __slots__ = ()
+
     def __init__(self, value: str) -> None:
+        super().__init__(self.validate(value))
+
+    @staticmethod
+    def validate(value: str) -> str:
+        """
+        Check that a name is not empty.
+
+        :param value: The contact's name.
+        :return: The name unchanged.
+        :raises ValueError: If the name is empty.
+        """
         if not value:
             raise ValueError("Name cannot be empty.")
-        super().__init__(value)
+        return value
+
+
+_PHONE_RE = re.compile(r"^\d{10}\Z").match
 
 
 class Phone(Field):
@@ -86,29 +350,82 @@ class Phone(Field):
     :param value: The phone number as a string (must be exactly 10 digits).
     """
 
+    __slots__ = ()
+
     def __init__(self, value: str) -> None:
-        if not value.isdigit() or len(value) != 10:
+        super().__init__(self.validate(value))
+
+    @staticmethod
+    def validate(value: str) -> str:
+        """
+        Check that a phone number consists of exactly 10 digits.
+
+        :param value: The phone number as a string.
+        :return: The phone number unchanged.
+        :raises ValueError: If the phone number is invalid.
+        """
+        if not _PHONE_RE(value):
             raise ValueError("Phone number must consist of exactly 10 digits.")
-        super().__init__(value)
+        return value
+
+
+# Matches what strptime's "%d.%m.%Y" accepted: 1-2 digit day and month and
+# a 4-digit year, restricted to ASCII digits.
+_BIRTHDAY_RE = re.compile(r"(\d{1,2})\.(\d{1,2})\.(\d{4})", re.ASCII).fullmatch
 
 
-class Birthday(Field):
+class Birthday:
     """
     Class for storing a birthday.
 
-    :param value: The birthday as a string in DD.MM.YYYY format.
+    The date is kept as an integer key (month * 32 + day), which orders
+    birthdays within a year, plus the birth year. Unlike the other fields
+    it does not store a value attribute; value is computed from these.
+
+    :param value: The birthday as a string in DD.MM.YYYY format,
+                  or an already validated date.
     :raises ValueError: If the date is not in the correct format.
     """
 
-    def __init__(self, value: str) -> None:
-        try:
-            birthday_date = datetime.strptime(value, "%d.%m.%Y").date()
-        except ValueError:
-            raise ValueError("Invalid date format. Use DD.MM.YYYY")
-        self.value = birthday_date
+    __slots__ = ("key", "year")
+
+    def __init__(self, value: Union[str, date]) -> None:
+        if isinstance(value, str):
+            match = _BIRTHDAY_RE(value)
+            if match is None:
+                raise ValueError("Invalid date format. Use DD.MM.YYYY")
+            day, month, year = match.groups()
+            date_type = _date or _load_date()
+            try:
+                value = date_type(int(year), int(month), int(day))
+            except ValueError:
+                raise ValueError("Invalid date format. Use DD.MM.YYYY")
+        self.key = value.month * 32 + value.day
+        self.year = value.year
+
+    def to_date(self) -> date:
+        """
+        Return the birthday as a date.
+
+        :return: The date of birth.
+        """
+        date_type = _date or _load_date()
+        return date_type(self.year, self.key >> 5, self.key & 31)
+
+    @property
+    def value(self) -> date:
+        """
+        The birthday as a date, read-only.
+        """
+        return self.to_date()
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Only used for files written by the original object-graph format,
+        # where the value is a date.
+        Birthday.__init__(self, state["value"])
 
     def __str__(self) -> str:
-        return self.value.strftime("%d.%m.%Y")
+        return f"{self.key & 31:02d}.{self.key >> 5:02d}.{self.year:04d}"
 
 
 class Record:
@@ -118,10 +435,29 @@ class Record:
     :param name: The contact's name.
     """
 
+    __slots__ = ("name", "phones", "_birthday", "_book")
+
     def __init__(self, name: str) -> None:
-        self.name = Name(name)
-        self.phones: List[Phone] = []
-        self.birthday = None
+        self.name: str = Name.validate(name)
+        # Insertion-ordered dict used as an ordered set for O(1) lookups.
+        self.phones: Dict[str, None] = {}
+        self._birthday: Optional[Birthday] = None
+        # The AddressBook holding this record, whose birthday index has to
+        # follow birthday changes.
+        self._book: Optional[AddressBook] = None
+
+    @property
+    def birthday(self) -> Optional[Birthday]:
+        return self._birthday
+
+    @birthday.setter
+    def birthday(self, birthday: Optional[Birthday]) -> None:
+        book = self._book
+        if book is not None:
+            book._unindex_birthday(self)
+        self._birthday = birthday
+        if book is not None:
+            book._index_birthday(self)
 
     def add_phone(self, phone: str) -> None:
         """
@@ -129,7 +465,23 @@ class Record:
 
         :param phone: A phone number as a string.
         """
-        self.phones.append(Phone(phone))
+        self.phones[Phone.validate(phone)] = None
+
+    def add_phones(self, phones: Iterable[str]) -> None:
+        """
+        Add several phone numbers to the record at once.
+
+        All numbers are validated before any is added, so either every
+        number is stored or none is.
+
+        :param phones: Phone numbers as strings.
+        :raises ValueError: If any phone number is invalid.
+        """
+        phones = list(phones)
+        invalid = [phone for phone in phones if not _PHONE_RE(phone)]
+        if invalid:
+            raise ValueError("Phone number must consist of exactly 10 digits: " + ", ".join(invalid))
+        self.phones.update(dict.fromkeys(phones))
 
     def remove_phone(self, phone: str) -> None:
         """
@@ -137,10 +489,7 @@ class Record:
 
         :param phone: The phone number to remove.
         """
-        for p in self.phones:
-            if p.value == phone:
-                self.phones.remove(p)
-                break
+        self.phones.pop(phone, None)
 
     def edit_phone(self, old_phone: str, new_phone: str) -> None:
         """
@@ -149,10 +498,9 @@ class Record:
         :param old_phone: The existing phone number.
         :param new_phone: The new phone number.
         """
-        for idx, p in enumerate(self.phones):
-            if p.value == old_phone:
-                self.phones[idx] = Phone(new_phone)
-                break
+        if old_phone in self.phones:
+            new_phone = Phone.validate(new_phone)
+            self.phones = {new_phone if p == old_phone else p: None for p in self.phones}
 
     def find_phone(self, phone: str) -> str:
         """
@@ -161,10 +509,7 @@ class Record:
         :param phone: The phone number to search for.
         :return: The phone number if found, or an empty string.
         """
-        for p in self.phones:
-            if p.value == phone:
-                return p.value
-        return ""
+        return phone if phone in self.phones else ""
 
     def add_birthday(self, birthday_str: str) -> None:
         """
@@ -174,33 +519,108 @@ class Record:
         """
         self.birthday = Birthday(birthday_str)
 
+    def to_row(self) -> tuple:
+        """
+        Convert the record to plain values.
+
+        :return: A (name, phones, birthday_ordinal) tuple, where
+                 birthday_ordinal is None if the birthday is not set.
+        """
+        birthday = self.birthday.to_date().toordinal() if self.birthday else None
+        return self.name, tuple(self.phones), birthday
+
+    @classmethod
+    def _rebuild(cls, name: str, phones: Tuple[str, ...], birthday_ordinal: Optional[int]) -> "Record":
+        """
+        Rebuild a record from plain values without re-validating phones
+        or the birthday.
+
+        Strings are interned so names and phone numbers shared between
+        records are stored once and compare by identity.
+
+        :param name: The contact's name.
+        :param phones: The phone numbers as strings.
+        :param birthday_ordinal: The birthday as a date ordinal, or None.
+        :return: A new Record instance.
+        """
+        date_type = _date or _load_date()
+        record = cls(sys.intern(name))
+        record.phones = dict.fromkeys(map(sys.intern, phones))
+        if birthday_ordinal is not None:
+            record.birthday = Birthday(date_type.fromordinal(birthday_ordinal))
+        return record
+
+    def __reduce__(self):
+        return Record._rebuild, self.to_row()
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Only used for files written by the original object-graph format,
+        # where name and phones are Name/Phone objects.
+        self.name = sys.intern(Name.validate(state["name"].value))
+        self.phones = dict.fromkeys(sys.intern(Phone.validate(p.value)) for p in state["phones"])
+        birthday = state["birthday"]
+        if birthday is not None and not isinstance(birthday, Birthday):
+            raise TypeError("birthday must be a Birthday")
+        self._book = None
+        self._birthday = birthday
+
     def __str__(self) -> str:
-        phones_str = '; '.join(p.value for p in self.phones)
+        phones_str = '; '.join(self.phones)
         birthday_str = str(self.birthday) if self.birthday else "Not set"
-        return f"Contact name: {self.name.value}, phones: {phones_str}, birthday: {birthday_str}"
+        return f"Contact name: {self.name}, phones: {phones_str}, birthday: {birthday_str}"
 
 
-class AddressBook(UserDict):
+class AddressBook(dict):
     """
     Class for managing contact records.
+
+    Lookups are plain dict operations. Inserts and deletes, whether made
+    through add_record/delete or the dict API, go through Python-level
+    overrides that keep the birthday index in sync, so they cost a few
+    times more than on a plain dict; get_upcoming_birthdays no longer has
+    to scan every record in exchange.
+
+    :param args: An optional mapping or iterable of (name, Record) pairs,
+                 as accepted by dict.
+    :param kwargs: Records keyed by name.
     """
 
+    def __init__(self, *args: Any, **kwargs: Record) -> None:
+        super().__init__()
+        # Birthday index as parallel arrays: sorted Birthday.key values
+        # and the matching records.
+        self._bday_keys = array("i")
+        self._bday_records: List[Record] = []
+        self.journal: Optional[io.BufferedWriter] = None
+        if args or kwargs:
+            self.update(*args, **kwargs)
+
+    def log(self, op: int, *fields: str) -> None:
+        """
+        Record a mutation in the journal, if one is attached.
+
+        :param op: One of the OP_* constants.
+        :param fields: The string arguments of the operation.
+        """
+        if self.journal is not None:
+            write_journal(self.journal, op, *fields)
+
     def add_record(self, record: Record) -> None:
         """
         Add a record to the address book.
 
         :param record: The Record to add.
         """
-        self.data[record.name.value] = record
+        self[record.name] = record
 
-    def find(self, name: str) -> Record:
+    def find(self, name: str) -> Optional[Record]:
         """
         Find a record by contact name.
 
         :param name: The contact name.
         :return: The Record if found, otherwise None.
         """
-        return self.data.get(name)
+        return self.get(name)
 
     def delete(self, name: str) -> None:
         """
@@ -208,31 +628,138 @@ class AddressBook(UserDict):
 
         :param name: The name of the record to delete.
         """
-        if name in self.data:
-            del self.data[name]
+        self.pop(name, None)
+
+    # The dict mutators are overridden so the birthday index and the
+    # records' back-references stay in sync whichever API is used.
+
+    def __setitem__(self, name: str, record: Record) -> None:
+        if record._book is not None and record._book is not self:
+            raise ValueError("Record already belongs to another address book.")
+        old = self.get(name)
+        if old is record:
+            return
+        if old is not None:
+            self._detach(old)
+        dict.__setitem__(self, name, record)
+        record._book = self
+        if record._birthday is not None:
+            self._index_birthday(record)
+
+    def __delitem__(self, name: str) -> None:
+        self._detach(super().pop(name))
+
+    def pop(self, name: str, *default: Any) -> Any:
+        if name not in self:
+            if default:
+                return default[0]
+            raise KeyError(name)
+        record = super().pop(name)
+        self._detach(record)
+        return record
+
+    def popitem(self) -> Tuple[str, Record]:
+        name, record = super().popitem()
+        self._detach(record)
+        return name, record
+
+    def setdefault(self, name: str, default: Record) -> Record:  # type: ignore[override]
+        if name not in self:
+            self[name] = default
+        return self[name]
+
+    def update(self, *args: Any, **kwargs: Record) -> None:
+        for name, record in dict(*args, **kwargs).items():
+            self[name] = record
+
+    def __ior__(self, other: Any) -> AddressBook:  # type: ignore[misc]
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        for record in self.values():
+            record._book = None
+        super().clear()
+        self._bday_keys = array("i")
+        self._bday_records = []
+
+    def _bulk_load(self, records: Iterable[Record]) -> None:
+        # Fill an empty book and sort the birthday index once, instead of
+        # inserting each record into the sorted arrays.
+        super().update((record.name, record) for record in records)
+        pairs = []
+        for record in self.values():
+            record._book = self
+            if record.birthday is not None:
+                pairs.append((record.birthday.key, record))
+        pairs.sort(key=itemgetter(0))
+        self._bday_keys = array("i", [key for key, _ in pairs])
+        self._bday_records = [record for _, record in pairs]
+
+    def _detach(self, record: Record) -> None:
+        self._unindex_birthday(record)
+        record._book = None
+
+    def _index_birthday(self, record: Record) -> None:
+        if record.birthday:
+            key = record.birthday.key
+            i = bisect_right(self._bday_keys, key)
+            self._bday_keys.insert(i, key)
+            self._bday_records.insert(i, record)
+
+    def _unindex_birthday(self, record: Record) -> None:
+        if record.birthday:
+            key = record.birthday.key
+            for i in range(bisect_left(self._bday_keys, key), bisect_right(self._bday_keys, key)):
+                if self._bday_records[i] is record:
+                    del self._bday_keys[i]
+                    del self._bday_records[i]
+                    break
+
+    @classmethod
+    def _rebuild(cls, rows: tuple) -> "AddressBook":
+        """
+        Rebuild an address book from plain record values.
 
-    def get_upcoming_birthdays(self) -> List[Record]:
+        :param rows: (name, phones, birthday_ordinal) tuples.
+        :return: A new AddressBook instance.
+        """
+        book = cls()
+        book._bulk_load(Record._rebuild(*row) for row in rows)
+        return book
+
+    def __reduce__(self):
+        return AddressBook._rebuild, (tuple(r.to_row() for r in self.values()),)
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Only used for files written by the original object-graph format,
+        # where the records are kept in the UserDict "data" attribute.
+        AddressBook.__init__(self)
+        records = list(state["data"].values())
+        if not all(isinstance(record, Record) for record in records):
+            raise TypeError("address book entries must be Records")
+        self._bulk_load(records)
+
+    def get_upcoming_birthdays(self, today: Optional[date] = None) -> List[Record]:
         """
         Get contacts with birthdays in the next 7 days.
 
-        :return: A list of Record objects.
-        """
-        today = date.today()
-        upcoming = []
-        for record in self.data.values():
-            if record.birthday:
-                bday = record.birthday.value.replace(year=today.year)
-                if bday < today:
-                    bday = bday.replace(year=today.year + 1)
-                delta = (bday - today).days
-                # Adjust greeting date if birthday falls on a weekend.
-                if bday.weekday() == 5:
-                    bday += timedelta(days=2)
-                elif bday.weekday() == 6:
-                    bday += timedelta(days=1)
-                if 0 <= delta <= 7:
-                    upcoming.append(record)
-        return upcoming
+        :param today: The day to count from; defaults to the current date.
+        :return: A list of Record objects ordered by birthday.
+        """
+        from datetime import timedelta
+
+        if today is None:
+            today = (_date or _load_date()).today()
+        end = today + timedelta(days=7)
+        start_key = today.month * 32 + today.day
+        end_key = end.month * 32 + end.day
+        lo = bisect_left(self._bday_keys, start_key)
+        hi = bisect_right(self._bday_keys, end_key)
+        if start_key <= end_key:
+            return self._bday_records[lo:hi]
+        # The window wraps around the end of the year.
+        return self._bday_records[lo:] + self._bday_records[:hi]
 
 
 # --- Command Handlers with Error Handling ---
@@ -272,9 +799,11 @@ def add_contact(args: list, book: AddressBook) -> str:
     if record is None:
         record = Record(name)
         book.add_record(record)
+        book.log(OP_ADD_CONTACT, name)
         message = "Contact added."
     if phone:
         record.add_phone(phone)
+        book.log(OP_ADD_PHONE, name, phone)
     return message
 
 
@@ -292,6 +821,7 @@ def change_contact(args: list, book: AddressBook) -> str:
     if record is None:
         return "Contact not found."
     record.edit_phone(old_phone, new_phone)
+    book.log(OP_EDIT_PHONE, name, old_phone, new_phone)
     return "Contact updated."
 
 
@@ -308,7 +838,7 @@ def show_phone(args: list, book: AddressBook) -> str:
     record = book.find(name)
     if record is None:
         return "Contact not found."
-    return "; ".join(p.value for p in record.phones) if record.phones else "No phone numbers found."
+    return "; ".join(record.phones) if record.phones else "No phone numbers found."
 
 
 def show_all(book: AddressBook) -> str:
@@ -318,9 +848,9 @@ def show_all(book: AddressBook) -> str:
     :param book: The AddressBook instance.
     :return: A formatted string of all contacts.
     """
-    if not book.data:
+    if not book:
         return "No contacts available."
-    return "\n".join(str(record) for record in book.data.values())
+    return "\n".join(str(record) for record in book.values())
 
 
 @input_error
@@ -337,6 +867,7 @@ def add_birthday(args: list, book: AddressBook) -> str:
     if record is None:
         return "Contact not found."
     record.add_birthday(birthday_str)
+    book.log(OP_ADD_BIRTHDAY, name, birthday_str)
     return "Birthday added."
 
 
@@ -370,10 +901,20 @@ def birthdays(args: list, book: AddressBook) -> str:
     result = []
     for record in upcoming:
         bday_str = str(record.birthday) if record.birthday else "Not set"
-        result.append(f"{record.name.value}: {bday_str}")
+        result.append(f"{record.name}: {bday_str}")
     return "\n".join(result)
 
 
+COMMANDS = {
+    "add": add_contact,
+    "change": change_contact,
+    "phone": show_phone,
+    "add-birthday": add_birthday,
+    "show-birthday": show_birthday,
+    "birthdays": birthdays,
+}
+
+
 # --- Main CLI Loop ---
 
 def main() -> None:
@@ -392,30 +933,24 @@ def main() -> None:
       close / exit
     """
     book = load_data()
+    # Every change is appended to the journal as it happens, so nothing has
+    # to be written on exit; load_data compacts the journal on next start.
+    book.journal = open_journal()
     print("Welcome to the assistant bot!")
     while True:
         user_input = input("Enter a command: ")
-        command, *args = parse_input(user_input)
-        if command in ["close", "exit"]:
-            save_data(book)
-            print("Good bye!")
-            break
-        elif command == "hello":
-            print("How can I help you?")
-        elif command == "add":
-            print(add_contact(args, book))
-        elif command == "change":
-            print(change_contact(args, book))
-        elif command == "phone":
-            print(show_phone(args, book))
+        command, args = parse_input(user_input)
+        handler = COMMANDS.get(command)
+        if handler:
+            print(handler(args, book))
         elif command == "all":
             print(show_all(book))
-        elif command == "add-birthday":
-            print(add_birthday(args, book))
-        elif command == "show-birthday":
-            print(show_birthday(args, book))
-        elif command == "birthdays":
-            print(birthdays(args, book))
+        elif command == "hello":
+            print("How can I help you?")
+        elif command in ("close", "exit"):
+            book.journal.close()
+            print("Good bye!")
+            break
         else:
             print("Invalid command.")
 
@@ -0,0 +1,300 @@
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DATA = Path(__file__).resolve().parent / "data"
+MAIN = ROOT / "src" / "main.py"
+
+sys.path.insert(0, str(MAIN.parent))
+import main  # noqa: E402
+
+
+def run_cli(cwd: str, commands: str) -> str:
+    """
+    Run the assistant bot in cwd, feeding it the given commands.
+
+    :param cwd: The working directory holding the address book files.
+    :param commands: Newline-separated commands, ending with exit.
+    :return: The bot's standard output.
+    """
+    result = subprocess.run(
+        [sys.executable, str(MAIN)], input=commands, cwd=cwd,
+        capture_output=True, text=True, check=True,
+    )
+    return result.stdout
+
+
+class BaselineSnapshotTest(unittest.TestCase):
+    """
+    addressbook.pkl files written by the original object-graph format
+    (UserDict of Record/Name/Phone/Birthday objects) must keep loading.
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.mkdtemp()
+        shutil.copy(DATA / "baseline_addressbook.pkl", Path(self.tmp) / "addressbook.pkl")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmp)
+
+    def test_loads_records(self) -> None:
+        output = run_cli(self.tmp, "all\nphone John\nexit\n")
+        self.assertIn("Contact name: John, phones: 1234567890; 5555555555, birthday: 29.02.2000", output)
+        self.assertIn("Contact name: Jane, phones: , birthday: Not set", output)
+        self.assertIn("1234567890; 5555555555", output)
+
+    def test_keeps_records_after_compaction(self) -> None:
+        run_cli(self.tmp, "add Alice 1111111111\nexit\n")
+        output = run_cli(self.tmp, "all\nexit\n")
+        self.assertIn("Contact name: John, phones: 1234567890; 5555555555, birthday: 29.02.2000", output)
+        self.assertIn("Contact name: Jane, phones: , birthday: Not set", output)
+        self.assertIn("Contact name: Alice, phones: 1111111111, birthday: Not set", output)
+
+
+class PickleFormatTest(unittest.TestCase):
+    def test_round_trip(self) -> None:
+        book = main.AddressBook()
+        record = main.Record("John")
+        record.add_phone("1234567890")
+        record.add_birthday("01.02.2000")
+        book.add_record(record)
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = str(Path(tmp) / "addressbook.pkl")
+            main.save_data(book, filename)
+            loaded = main.load_data(filename)
+        self.assertEqual(str(loaded.find("John")), str(record))
+
+    def test_rejects_address_book_without_state(self) -> None:
+        # An AddressBook created by NEWOBJ with no BUILD state.
+        data = b"\x80\x04\x8c\x04main\x8c\x0bAddressBook\x93)\x81."
+        with self.assertRaises(ValueError):
+            main._book_from_pickle(data)
+
+    def test_rejects_unknown_state(self) -> None:
+        data = b"\x80\x04\x8c\x04main\x8c\x0bAddressBook\x93)\x81}\x8c\x05other}sb."
+        with self.assertRaises(ValueError):
+            main._book_from_pickle(data)
+
+
+class BirthdayTest(unittest.TestCase):
+    def test_accepts_dd_mm_yyyy(self) -> None:
+        self.assertEqual(str(main.Birthday("01.02.2000")), "01.02.2000")
+        self.assertEqual(str(main.Birthday("1.2.2000")), "01.02.2000")
+        self.assertEqual(str(main.Birthday("29.02.2000")), "29.02.2000")
+
+    def test_value_is_a_date(self) -> None:
+        self.assertEqual(main.Birthday("01.02.2000").value, date(2000, 2, 1))
+
+    def test_rejects_malformed_dates(self) -> None:
+        for value in ("01.02.99", "1_0.02.1990", "+1.2.1990", "29.02.2001", "32.01.2000", "01-02-2000"):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                main.Birthday(value)
+
+
+class RecordTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.record = main.Record("John")
+
+    def test_add_phone_ignores_duplicate(self) -> None:
+        self.record.add_phone("1234567890")
+        self.record.add_phone("1234567890")
+        self.assertEqual(list(self.record.phones), ["1234567890"])
+
+    def test_edit_phone_keeps_position(self) -> None:
+        self.record.add_phones(["1111111111", "2222222222", "3333333333"])
+        self.record.edit_phone("2222222222", "4444444444")
+        self.assertEqual(list(self.record.phones), ["1111111111", "4444444444", "3333333333"])
+
+    def test_edit_phone_to_existing_number_merges(self) -> None:
+        self.record.add_phones(["1111111111", "2222222222", "3333333333"])
+        self.record.edit_phone("3333333333", "1111111111")
+        self.assertEqual(list(self.record.phones), ["1111111111", "2222222222"])
+
+    def test_add_phones_adds_all_numbers(self) -> None:
+        self.record.add_phones(["1234567890", "5555555555"])
+        self.assertEqual(list(self.record.phones), ["1234567890", "5555555555"])
+
+    def test_add_phones_rejects_batch_with_invalid_number(self) -> None:
+        with self.assertRaises(ValueError) as cm:
+            self.record.add_phones(["1234567890", "123", "5555555555", "abc"])
+        self.assertEqual(str(cm.exception), "Phone number must consist of exactly 10 digits: 123, abc")
+        self.assertEqual(list(self.record.phones), [])
+
+    def test_add_phones_collapses_duplicates(self) -> None:
+        self.record.add_phone("5555555555")
+        self.record.add_phones(["1234567890", "5555555555", "1234567890"])
+        self.assertEqual(list(self.record.phones), ["5555555555", "1234567890"])
+
+
+def birthday_in(days: int) -> str:
+    """
+    Build a birthday whose next anniversary is the given number of days away.
+
+    :param days: Days from today.
+    :return: The birthday in DD.MM.YYYY format.
+    """
+    day = date.today() + timedelta(days=days)
+    if (day.month, day.day) == (2, 29):
+        return "29.02.2000"
+    return day.replace(year=1990).strftime("%d.%m.%Y")
+
+
+class BirthdayIndexTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.book = main.AddressBook()
+        self.record = main.Record("John")
+        self.book.add_record(self.record)
+        self.record.add_birthday(birthday_in(2))
+
+    def upcoming(self) -> list:
+        return [record.name for record in self.book.get_upcoming_birthdays()]
+
+    def test_record_add_birthday_updates_index(self) -> None:
+        self.assertEqual(self.upcoming(), ["John"])
+        self.record.add_birthday(birthday_in(100))
+        self.assertEqual(self.upcoming(), [])
+
+    def test_dict_mutators_update_index(self) -> None:
+        del self.book["John"]
+        self.assertEqual(self.upcoming(), [])
+        self.book.update(John=self.record)
+        self.assertEqual(self.upcoming(), ["John"])
+        self.book.pop("John")
+        self.assertEqual(self.upcoming(), [])
+        self.book["John"] = self.record
+        self.book.clear()
+        self.assertEqual(self.upcoming(), [])
+
+    def test_constructor_accepts_mapping(self) -> None:
+        self.book.delete("John")
+        book = main.AddressBook({"John": self.record})
+        self.assertIs(book.find("John"), self.record)
+        self.assertEqual([record.name for record in book.get_upcoming_birthdays()], ["John"])
+
+    def test_removed_record_no_longer_tracked(self) -> None:
+        self.book.delete("John")
+        self.record.add_birthday(birthday_in(1))
+        self.assertEqual(self.upcoming(), [])
+
+
+class UpcomingBirthdaysTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.book = main.AddressBook()
+
+    def add(self, name: str, birthday: str) -> None:
+        record = main.Record(name)
+        record.add_birthday(birthday)
+        self.book.add_record(record)
+
+    def upcoming(self, today: date) -> list:
+        return [record.name for record in self.book.get_upcoming_birthdays(today)]
+
+    def test_window_wraps_around_new_year(self) -> None:
+        self.add("Jan5", "05.01.1990")
+        self.add("Jan4", "04.01.1990")
+        self.add("Dec27", "27.12.1990")
+        self.add("Dec31", "31.12.1990")
+        self.add("Dec28", "28.12.1990")
+        self.add("Jan1", "01.01.1990")
+        self.assertEqual(self.upcoming(date(2026, 12, 28)), ["Dec28", "Dec31", "Jan1", "Jan4"])
+
+    def test_seventh_day_is_included(self) -> None:
+        self.add("Day7", "08.06.1990")
+        self.add("Day8", "09.06.1990")
+        self.assertEqual(self.upcoming(date(2026, 6, 1)), ["Day7"])
+
+    def test_february_29_in_non_leap_year(self) -> None:
+        self.add("Leap", "29.02.2000")
+        self.assertEqual(self.upcoming(date(2026, 2, 22)), ["Leap"])
+        self.assertEqual(self.upcoming(date(2026, 2, 28)), ["Leap"])
+        self.assertEqual(self.upcoming(date(2026, 3, 1)), [])
+
+
+class JsonFormatTest(unittest.TestCase):
+    def test_round_trip(self) -> None:
+        book = main.AddressBook()
+        record = main.Record("John")
+        record.add_phone("1234567890")
+        record.add_birthday("01.02.2000")
+        book.add_record(record)
+        loaded = main._book_from_json(main._book_to_json(book))
+        self.assertEqual(str(loaded.find("John")), str(record))
+
+    def test_rejects_malformed_entries(self) -> None:
+        for data in (
+            b'[]',
+            b'{"John": []}',
+            b'{"John": {"phones": "1234567890", "birthday": null}}',
+            b'{"John": {"phones": [1234567890], "birthday": null}}',
+            b'{"John": {"phones": ["123"], "birthday": null}}',
+            b'{"John": {"phones": [], "birthday": "01.02.2000"}}',
+            b'{"John": {"phones": [], "birthday": 0}}',
+            b'{"": {"phones": [], "birthday": null}}',
+            b'not json',
+        ):
+            with self.subTest(data=data), self.assertRaises(ValueError):
+                main._book_from_json(data)
+
+
+class JournalTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmp)
+
+    def test_journal_belongs_to_its_snapshot(self) -> None:
+        run_cli(self.tmp, "add John 1234567890\nexit\n")
+        other = main.load_data(str(Path(self.tmp) / "backup.json"))
+        self.assertIsNone(other.find("John"))
+        book = main.load_data(str(Path(self.tmp) / "addressbook.pkl"))
+        self.assertEqual(book.find("John").find_phone("1234567890"), "1234567890")
+
+    def test_long_record_is_journaled(self) -> None:
+        name = "N" * 70000
+        output = run_cli(self.tmp, f"add {name} 1234567890\nexit\n")
+        self.assertIn("Contact added.", output)
+        book = main.load_data(str(Path(self.tmp) / "addressbook.pkl"))
+        self.assertIsNotNone(book.find(name))
+
+    def test_records_after_torn_frame_are_kept(self) -> None:
+        # A crash left only part of an "add Alice" record in the journal.
+        frame = main._FRAME_HEADER.pack(main.OP_ADD_CONTACT, 5) + b"Ali"
+        (Path(self.tmp) / "addressbook.pkl.log").write_bytes(frame)
+        run_cli(self.tmp, "add Bob 1111111111\nadd Carol 2222222222\nadd Dave 3333333333\nexit\n")
+        book = main.load_data(str(Path(self.tmp) / "addressbook.pkl"))
+        self.assertEqual(sorted(book), ["Bob", "Carol", "Dave"])
+
+    def test_unreadable_frame_stops_replay(self) -> None:
+        journal = Path(self.tmp) / "addressbook.pkl.log"
+        with open(journal, "wb") as f:
+            main.write_journal(f, main.OP_ADD_CONTACT, "John")
+            main.write_journal(f, main.OP_ADD_PHONE, "John", "123")
+            main.write_journal(f, main.OP_ADD_CONTACT, "Jane")
+            f.write(main._FRAME_HEADER.pack(main.OP_ADD_CONTACT, 1) + b"\xff")
+        book = main.load_data(str(Path(self.tmp) / "addressbook.pkl"))
+        self.assertEqual(list(book), ["John"])
+        self.assertEqual(journal.stat().st_size, 0)
+
+    def test_failed_save_keeps_previous_snapshot(self) -> None:
+        class Unpicklable:
+            def __reduce__(self):
+                raise RuntimeError("crash")
+
+        filename = str(Path(self.tmp) / "addressbook.pkl")
+        book = main.AddressBook()
+        book.add_record(main.Record("John"))
+        main.save_data(book, filename)
+        with self.assertRaises(RuntimeError):
+            main.save_data(Unpicklable(), filename)
+        self.assertIsNotNone(main.load_data(filename).find("John"))
+        self.assertFalse(Path(filename + ".tmp").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()